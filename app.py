@@ -1,169 +1,273 @@
-from flask import Flask, request, jsonify, send_file, render_template_string
-from flask_cors import CORS
-import os, uuid, subprocess, threading
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
+import os, re, sys, uuid, asyncio
+from dataclasses import dataclass, field
 from pathlib import Path
-from werkzeug.utils import secure_filename
-import json, time
+from typing import NamedTuple
+import aiofiles
+import orjson, time
 from main import main as generate_podcast  # Import your main function
 
-app = Flask(__name__)
-CORS(app)
+app = FastAPI(title="Podcast Generator API", default_response_class=ORJSONResponse)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
 
 # Configuration
 UPLOAD_FOLDER = Path('uploads')
 UPLOAD_FOLDER.mkdir(exist_ok=True)
 ALLOWED_EXTENSIONS = {'pdf', 'txt', 'md', 'doc', 'docx'}
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
 
-# Store generation jobs
-generation_jobs = {}
+# Job states, interned so records rebuilt from Redis share one copy of each
+PENDING, RUNNING, COMPLETED, FAILED = map(sys.intern, ('pending', 'running', 'completed', 'failed'))
+
+# Generations allowed to run at once in this process; later jobs wait as 'pending'
+MAX_CONCURRENT_JOBS = int(os.getenv('MAX_CONCURRENT_JOBS', 2))
+job_slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+
+# Job records expire after a day
+JOB_TTL = int(os.getenv('JOB_TTL', 24 * 3600))
+
+# Keep references to running generation tasks so they aren't garbage collected
+background_tasks = set()
 
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def secure_filename(filename):
+    """Reduce an uploaded filename to a safe basename"""
+    filename = Path(filename.replace('\\', '/')).name
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', filename).strip('._')
+
+def error(message, status_code):
+    return ORJSONResponse({'error': message}, status_code=status_code)
+
+class UploadedFile(NamedTuple):
+    original_name: str
+    saved_path: str
+    size: int
+
+@dataclass(slots=True)
 class GenerationJob:
-    def __init__(self, job_id):
-        self.id = job_id
-        self.status = 'pending'
-        self.progress = 0
-        self.message = 'Initializing...'
-        self.files = []
-        self.result = None
-        self.error = None
-
-@app.route('/')
-def index():
+    id: str
+    status: str = PENDING
+    progress: int = 0
+    message: str = 'Initializing...'
+    files: list = field(default_factory=list)
+    result: dict | None = None
+    error: str | None = None
+
+    def to_mapping(self):
+        """Flatten the job into a Redis hash mapping"""
+        return {
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'files': orjson.dumps([f._asdict() for f in self.files]),
+            'result': orjson.dumps(self.result),
+            'error': self.error or ''
+        }
+
+    @classmethod
+    def from_mapping(cls, job_id, data):
+        job = cls(job_id)
+        job.status = sys.intern(data['status'])
+        job.progress = int(data['progress'])
+        job.message = data['message']
+        job.files = [UploadedFile(**f) for f in orjson.loads(data['files'])]
+        job.result = orjson.loads(data['result'])
+        job.error = data['error'] or None
+        return job
+
+class JobStore:
+    """Generation job registry.
+
+    With REDIS_URL set, jobs live in Redis hashes (``job:<id>``) that expire
+    after JOB_TTL, so they survive restarts and every Uvicorn worker sees the
+    same state. Otherwise they are kept in process memory with the same TTL.
+    """
+
+    def __init__(self, redis_url=None, ttl=JOB_TTL):
+        self.ttl = ttl
+        self.redis = None
+        if redis_url:
+            from redis import asyncio as aioredis
+            self.redis = aioredis.from_url(redis_url, decode_responses=True)
+        # job_id -> (expires_at, job), kept in expiry order
+        self._jobs = {}
+
+    async def save(self, job):
+        if self.redis:
+            key = f"job:{job.id}"
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=job.to_mapping())
+                pipe.expire(key, self.ttl)
+                await pipe.execute()
+            return
+
+        now = time.monotonic()
+        self._jobs.pop(job.id, None)
+        self._jobs[job.id] = (now + self.ttl, job)
+        # Oldest entries sit at the front; drop them once expired
+        while self._jobs:
+            oldest_id, (expires_at, _) = next(iter(self._jobs.items()))
+            if expires_at > now:
+                break
+            del self._jobs[oldest_id]
+
+    async def get(self, job_id):
+        if self.redis:
+            data = await self.redis.hgetall(f"job:{job_id}")
+            return GenerationJob.from_mapping(job_id, data) if data else None
+
+        entry = self._jobs.get(job_id)
+        if not entry or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+# Store generation jobs
+jobs = JobStore(os.getenv('REDIS_URL'))
+
+async def run_queued_generation(job, file_paths):
+    """Wait for a free generation slot, then run the job"""
+    async with job_slots:
+        await run_generation_async(job, file_paths)
+
+def start_generation(job, file_paths):
+    """Schedule podcast generation on the event loop"""
+    task = asyncio.create_task(run_queued_generation(job, file_paths))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+@app.get('/')
+async def index():
     """Serve the web interface"""
     # In a real setup, you'd serve the HTML file directly
     # For now, return a simple message
-    return jsonify({"message": "Podcast Generator API Ready"})
+    return {"message": "Podcast Generator API Ready"}
 
-@app.route('/api/upload', methods=['POST'])
-def upload_files():
+@app.post('/api/upload')
+async def upload_files(files: list[UploadFile] | None = File(None)):
     """Handle file uploads"""
     try:
-        if 'files' not in request.files:
-            return jsonify({'error': 'No files provided'}), 400
-        
-        files = request.files.getlist('files')
-        if not files or all(f.filename == '' for f in files):
-            return jsonify({'error': 'No files selected'}), 400
-        
+        if not files:
+            return error('No files provided', 400)
+
+        if all(not f.filename for f in files):
+            return error('No files selected', 400)
+
         job_id = str(uuid.uuid4())
         job = GenerationJob(job_id)
-        
+
         uploaded_files = []
         for file in files:
-            if file and allowed_file(file.filename):
+            if file.filename and allowed_file(file.filename):
                 filename = secure_filename(file.filename)
                 # Add timestamp to avoid conflicts
                 unique_filename = f"{int(time.time())}_{filename}"
                 file_path = UPLOAD_FOLDER / unique_filename
-                file.save(file_path)
+                # Copy in fixed-size chunks so memory stays bounded for large files
+                async with aiofiles.open(file_path, 'wb') as f:
+                    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
                 uploaded_files.append(str(file_path))
-                job.files.append({
-                    'original_name': filename,
-                    'saved_path': str(file_path),
-                    'size': file_path.stat().st_size
-                })
-        
+                job.files.append(UploadedFile(filename, str(file_path), file_path.stat().st_size))
+
         if not uploaded_files:
-            return jsonify({'error': 'No valid files uploaded'}), 400
-        
-        generation_jobs[job_id] = job
-        
+            return error('No valid files uploaded', 400)
+
+        await jobs.save(job)
+
         # Start generation in background
-        thread = threading.Thread(
-            target=run_generation, 
-            args=(job_id, uploaded_files)
-        )
-        thread.daemon = True
-        thread.start()
-        
-        return jsonify({
+        start_generation(job, uploaded_files)
+
+        return {
             'job_id': job_id,
             'message': 'Files uploaded successfully, generation started',
-            'files': [f['original_name'] for f in job.files]
-        })
-        
+            'files': [f.original_name for f in job.files]
+        }
+
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error(str(e), 500)
 
-@app.route('/api/generate/rss', methods=['POST'])
-def generate_from_rss():
+@app.post('/api/generate/rss')
+async def generate_from_rss():
     """Generate podcast from RSS feeds"""
     try:
         job_id = str(uuid.uuid4())
         job = GenerationJob(job_id)
-        generation_jobs[job_id] = job
-        
+        await jobs.save(job)
+
         # Start RSS generation in background
-        thread = threading.Thread(
-            target=run_generation, 
-            args=(job_id, None)
-        )
-        thread.daemon = True
-        thread.start()
-        
-        return jsonify({
+        start_generation(job, None)
+
+        return {
             'job_id': job_id,
             'message': 'RSS-based podcast generation started'
-        })
-        
+        }
+
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error(str(e), 500)
 
-@app.route('/api/status/<job_id>')
-def get_job_status(job_id):
+@app.get('/api/status/{job_id}')
+async def get_job_status(job_id: str):
     """Get generation job status"""
-    job = generation_jobs.get(job_id)
+    job = await jobs.get(job_id)
     if not job:
-        return jsonify({'error': 'Job not found'}), 404
-    
+        return error('Job not found', 404)
+
     response = {
         'job_id': job_id,
         'status': job.status,
         'progress': job.progress,
         'message': job.message
     }
-    
-    if job.status == 'completed' and job.result:
+
+    if job.status == COMPLETED and job.result:
         response['result'] = job.result
-    elif job.status == 'failed' and job.error:
+    elif job.status == FAILED and job.error:
         response['error'] = job.error
-        
-    return jsonify(response)
 
-@app.route('/api/download/<job_id>')
-def download_episode(job_id):
+    return response
+
+@app.get('/api/download/{job_id}')
+async def download_episode(job_id: str):
     """Download generated podcast episode"""
-    job = generation_jobs.get(job_id)
-    if not job or job.status != 'completed':
-        return jsonify({'error': 'Episode not ready'}), 404
-    
+    job = await jobs.get(job_id)
+    if not job or job.status != COMPLETED:
+        return error('Episode not ready', 404)
+
     if not job.result or 'episode_path' not in job.result:
-        return jsonify({'error': 'Episode file not found'}), 404
-    
+        return error('Episode file not found', 404)
+
     episode_path = Path(job.result['episode_path'])
     if not episode_path.exists():
-        return jsonify({'error': 'Episode file missing'}), 404
-    
-    return send_file(
+        return error('Episode file missing', 404)
+
+    return FileResponse(
         episode_path,
-        as_attachment=True,
-        download_name=f"{job.result.get('title', 'episode')}.mp3"
+        media_type='audio/mpeg',
+        filename=f"{job.result.get('title', 'episode')}.mp3"
     )
 
-@app.route('/api/episodes')
+@app.get('/api/episodes')
 def list_episodes():
     """List all generated episodes"""
+    # Plain def: FastAPI runs it in the threadpool, keeping the directory scan off the event loop
     episodes_dir = Path('episodes')
     if not episodes_dir.exists():
-        return jsonify({'episodes': []})
-    
+        return {'episodes': []}
+
     episodes = []
     for episode_dir in sorted(episodes_dir.iterdir(), reverse=True):
-        if episode_dir.is_dir():
+        # Dot-directories hold the generator's caches, not episodes
+        if episode_dir.is_dir() and not episode_dir.name.startswith('.'):
             # Look for the MP3 file
             mp3_files = list(episode_dir.glob('*.mp3'))
             if mp3_files:
@@ -175,51 +279,34 @@ def list_episodes():
                     'size': episode_file.stat().st_size,
                     'duration': None  # Could add duration detection
                 })
-    
-    return jsonify({'episodes': episodes})
 
-def run_generation(job_id, file_paths):
+    return {'episodes': episodes}
+
+async def run_generation_async(job, file_paths):
     """Run podcast generation in background"""
-    job = generation_jobs[job_id]
-    
     try:
-        job.status = 'running'
+        job.status = RUNNING
         job.progress = 10
         job.message = 'Starting podcast generation...'
-        
-        # Update progress periodically (in real implementation)
-        progress_steps = [
-            (20, 'Extracting text from files...'),
-            (30, 'Analyzing content...'),
-            (40, 'Generating script with AI...'),
-            (60, 'Creating voice audio...'),
-            (80, 'Mixing with background music...'),
-            (90, 'Uploading to platforms...'),
-            (95, 'Finalizing...')
-        ]
-        
-        def update_progress():
-            for progress, message in progress_steps:
-                if job.status != 'running':
-                    return
-                job.progress = progress
-                job.message = message
-                time.sleep(2)  # Simulate work
-        
-        # Start progress updates in background
-        progress_thread = threading.Thread(target=update_progress)
-        progress_thread.daemon = True
-        progress_thread.start()
-        
+        await jobs.save(job)
+
+        loop = asyncio.get_running_loop()
+
+        async def set_progress(progress, message):
+            job.progress = progress
+            job.message = message
+            await jobs.save(job)
+
+        def progress_cb(progress, message):
+            # Called from the generation thread; apply the update on the event loop
+            asyncio.run_coroutine_threadsafe(set_progress(progress, message), loop)
+
         # Run the actual generation
-        # This calls your main() function from main.py
-        if file_paths:
-            # Generate from uploaded files
-            result = generate_podcast(file_paths)
-        else:
-            # Generate from RSS feeds
-            result = generate_podcast()
-        
+        # main() is blocking (SDK calls, ffmpeg), so it runs in a worker thread
+        # while the event loop keeps serving status requests.
+        # file_paths is None for RSS-based generation.
+        result = await asyncio.to_thread(generate_podcast, file_paths, progress_cb)
+
         # In a real implementation, modify your main() function to return:
         # {
         #     'episode_path': '/path/to/episode.mp3',
@@ -228,12 +315,12 @@ def run_generation(job_id, file_paths):
         #     'website_url': 'https://demetri.xyz/episode/123',
         #     'rss_url': 'https://demetri.xyz/feed.xml'
         # }
-        
+
         # For now, simulate a result
         timestamp = time.strftime('%Y%m%d-%H%M')
         episode_dir = Path('episodes') / timestamp
         episode_file = episode_dir / f"demetri.xyz_{timestamp}.mp3"
-        
+
         job.result = {
             'episode_path': str(episode_file),
             'title': f"Demetri.xyz — {time.strftime('%b %d, %Y')}",
@@ -242,11 +329,12 @@ def run_generation(job_id, file_paths):
             'rss_url': 'https://demetri.xyz/feed.xml',
             'twitter_url': 'https://twitter.com/your_handle'
         }
-        
-        job.status = 'completed'
+
+        job.status = COMPLETED
         job.progress = 100
         job.message = 'Podcast generated successfully!'
-        
+        await jobs.save(job)
+
         # Clean up uploaded files
         if file_paths:
             for file_path in file_paths:
@@ -254,17 +342,18 @@ def run_generation(job_id, file_paths):
                     Path(file_path).unlink()
                 except:
                     pass
-        
+
     except Exception as e:
-        job.status = 'failed'
+        job.status = FAILED
         job.error = str(e)
         job.message = f'Generation failed: {str(e)}'
         print(f"Generation error: {e}")
+        await jobs.save(job)
 
-@app.route('/api/config')
-def get_config():
+@app.get('/api/config')
+async def get_config():
     """Get configuration options"""
-    return jsonify({
+    return {
         'ai_services': ['gemini', 'openai'],
         'voices': {
             'host': ['your_voice', 'alloy', 'echo', 'nova'],
@@ -272,24 +361,26 @@ def get_config():
         },
         'max_file_size': 50 * 1024 * 1024,  # 50MB
         'allowed_extensions': list(ALLOWED_EXTENSIONS)
-    })
+    }
 
-@app.route('/webhook/spotify', methods=['POST'])
-def spotify_webhook():
+@app.post('/webhook/spotify')
+async def spotify_webhook(request: Request):
     """Handle Spotify webhook notifications"""
     # Spotify doesn't have direct upload, but you could use this
     # for other podcast platform webhooks
-    data = request.get_json()
+    data = await request.json()
     print(f"Received webhook: {data}")
-    return jsonify({'status': 'received'})
+    return {'status': 'received'}
 
 if __name__ == '__main__':
+    import uvicorn
+
     print("🎧 Podcast Generator API starting...")
     print("📁 Upload endpoint: POST /api/upload")
     print("📡 RSS generation: POST /api/generate/rss")
     print("📊 Status check: GET /api/status/<job_id>")
     print("⬇️  Download: GET /api/download/<job_id>")
     print("📋 Episodes: GET /api/episodes")
-    
-    # Run in development mode
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+
+    # Run in development mode (production: uvicorn app:app --loop uvloop)
+    uvicorn.run('app:app', host='0.0.0.0', port=5000, reload=True)
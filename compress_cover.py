@@ -1,25 +1,47 @@
-from PIL import Image
+import os
+
+SRC = 'assets/cover.png'
+DST = 'assets/cover.jpg'
+
+try:
+    import pyvips
+except (ImportError, OSError):
+    # OSError: pyvips is installed but the libvips shared library is missing
+    pyvips = None
+
+if pyvips:
+    # libvips streams the image in tiles and shrinks on load, so memory stays small
+    # Resize to fit 1400x1400 (Spotify/Apple Podcasts recommended size)
+    img = pyvips.Image.thumbnail(SRC, 1400, height=1400, size='down')
 
-# Open the image
-img = Image.open('assets/cover.png')
+    # Flatten transparency onto white
+    if img.hasalpha():
+        img = img.flatten(background=[255, 255, 255])
 
-# Resize to 1400x1400 (Spotify/Apple Podcasts recommended size)
-img.thumbnail((1400, 1400), Image.Resampling.LANCZOS)
+    # Save as optimized progressive JPEG (much smaller than PNG)
+    img.jpegsave(DST, Q=85, optimize_coding=True, interlace=True, strip=True)
+else:
+    from PIL import Image
 
-# Convert to RGB if it's RGBA (PNG with transparency)
-if img.mode == 'RGBA':
-    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-    rgb_img.paste(img, mask=img.split()[3])
-    img = rgb_img
+    # Open the image
+    img = Image.open(SRC)
 
-# Save as optimized JPEG (much smaller than PNG)
-img.save('assets/cover.jpg', 'JPEG', quality=85, optimize=True)
+    # Resize to 1400x1400 (Spotify/Apple Podcasts recommended size)
+    img.thumbnail((1400, 1400), Image.Resampling.LANCZOS)
+
+    # Convert to RGB if it's RGBA (PNG with transparency)
+    if img.mode == 'RGBA':
+        rgb_img = Image.new('RGB', img.size, (255, 255, 255))
+        rgb_img.paste(img, mask=img.split()[3])
+        img = rgb_img
+
+    # Save as optimized JPEG (much smaller than PNG)
+    img.save(DST, 'JPEG', quality=85, optimize=True, progressive=True)
 
 print("✅ Compressed cover saved as cover.jpg")
 
-import os
-original_size = os.path.getsize('assets/cover.png') / 1024 / 1024
-new_size = os.path.getsize('assets/cover.jpg') / 1024 / 1024
+original_size = os.path.getsize(SRC) / 1024 / 1024
+new_size = os.path.getsize(DST) / 1024 / 1024
 print(f"Original: {original_size:.2f} MB")
 print(f"Compressed: {new_size:.2f} MB")
 print(f"Saved: {original_size - new_size:.2f} MB ({((original_size - new_size) / original_size * 100):.1f}%)")
@@ -1,32 +1,79 @@
-import os, re, uuid, time, datetime as dt, feedparser, yaml, requests, json
-import PyPDF2
+import os, re, uuid, time, shutil, hashlib, subprocess, datetime as dt, yaml, requests
+import orjson, threading
+from diskcache import Cache
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
-from bs4 import BeautifulSoup
+from typing import NamedTuple
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+import xml.etree.ElementTree as ET
+from selectolax.parser import HTMLParser
 from dotenv import load_dotenv
-from pydub import AudioSegment
-from pydub.effects import normalize
-import google.generativeai as genai
-from openai import OpenAI
-import tweepy
-from elevenlabs.client import ElevenLabs
-from elevenlabs import save
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
-# API Clients
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-elevenlabs_client = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
-
-# Twitter API setup
-twitter_client = tweepy.Client(
-    bearer_token=os.getenv("TWITTER_BEARER_TOKEN"),
-    consumer_key=os.getenv("TWITTER_API_KEY"),
-    consumer_secret=os.getenv("TWITTER_API_SECRET"),
-    access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
-    access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET"),
-    wait_on_rate_limit=True
-)
+# API clients are built on first use, so importing this module (e.g. from
+# app.py) doesn't load every SDK up front and a run only loads the ones it calls
+@lru_cache(maxsize=None)
+def get_openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+@lru_cache(maxsize=None)
+def get_genai():
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai
+
+@lru_cache(maxsize=None)
+def get_elevenlabs_client():
+    from elevenlabs.client import ElevenLabs
+    return ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
+
+@lru_cache(maxsize=None)
+def get_twitter_client():
+    import tweepy
+    return tweepy.Client(
+        bearer_token=os.getenv("TWITTER_BEARER_TOKEN"),
+        consumer_key=os.getenv("TWITTER_API_KEY"),
+        consumer_secret=os.getenv("TWITTER_API_SECRET"),
+        access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
+        access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET"),
+        wait_on_rate_limit=True
+    )
+
+# Optional accelerators, probed on first use; None when not installed
+@lru_cache(maxsize=None)
+def get_pymupdf():
+    try:
+        import pymupdf
+    except ImportError:
+        return None
+    return pymupdf
+
+@lru_cache(maxsize=None)
+def get_multipart_encoder():
+    try:
+        from requests_toolbelt import MultipartEncoder
+    except ImportError:
+        return None
+    return MultipartEncoder
+
+_LAZY_CLIENTS = {
+    "openai_client": get_openai_client,
+    "elevenlabs_client": get_elevenlabs_client,
+    "twitter_client": get_twitter_client,
+}
+
+def __getattr__(name):
+    # Keeps main.openai_client etc. working for importers (PEP 562)
+    if name in _LAZY_CLIENTS:
+        return _LAZY_CLIENTS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 CFG = yaml.safe_load(Path("config.yaml").read_text())
 TITLE = os.getenv("PODCAST_TITLE", "Demetri.xyz")
@@ -34,73 +81,199 @@ MAX_STORIES = int(os.getenv("MAX_STORIES", "4"))
 OUTDIR = Path(CFG["output"]["dir"])
 OUTDIR.mkdir(exist_ok=True)
 
+# Shared HTTP session so article fetches reuse pooled keep-alive connections
+http_session = requests.Session()
+http_session.headers["User-Agent"] = "Mozilla/5.0"
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+)
+http_session.mount("https://", _adapter)
+http_session.mount("http://", _adapter)
+
+# Characters of each uploaded document given to the LLM; PDFs stop extracting
+# at PDF_EXTRACT_CHARS, leaving headroom for whitespace that clean() collapses
+FILE_CONTENT_CHARS = 8000
+PDF_EXTRACT_CHARS = 12000
+
+# Persistent cache for fetched pages, LLM replies and story write-ups (LRU-evicted past 500 MB)
+cache = Cache(str(OUTDIR / ".cache"), size_limit=500 * 1024 * 1024)
+PAGE_CACHE_TTL = 7 * 24 * 3600
+# Bump when the story prompt changes so stale write-ups aren't reused
+STORY_PROMPT_VERSION = "2"
+LLM_CACHE_TTL = 30 * 24 * 3600
+
+# Content-addressed store of synthesized speech, so repeated lines skip TTS
+TTS_CACHE_DIR = OUTDIR / ".ttscache"
+ELEVENLABS_MODEL = "eleven_monolingual_v1"
+OPENAI_TTS_MODEL, OPENAI_TTS_VOICE = "tts-1", "alloy"
+
+_WS_RE = re.compile(r"\s+")
+# Speaker tag opening a script line, e.g. "HOST1: ...", "**Demetri: ...", "<HOST2> ...";
+# group 1 is set for the primary host, group 2 for the secondary, group 3 is the text
+_PRIMARY_HOST = CFG.get("hosts", {}).get("primary", {}).get("name", "HOST1")
+_SECONDARY_HOST = CFG.get("hosts", {}).get("secondary", {}).get("name", "HOST2")
+_SPEAKER_RE = re.compile(
+    rf"[*<]*\s*(?:({re.escape(_PRIMARY_HOST)}|HOST1)|({re.escape(_SECONDARY_HOST)}|HOST2))\s*[:>](.*)"
+)
+
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+ET.register_namespace("itunes", ITUNES_NS)
+
+class Bullet(NamedTuple):
+    """Summarized RSS story"""
+    title: str
+    points: str
+    link: str
+
+class FileSource(NamedTuple):
+    """Text extracted from an uploaded file"""
+    filename: str
+    content: str
+    type: str = "file"
+
 # Voice configuration
 HOST_VOICE_ID = os.getenv("ELEVENLABS_HOST_VOICE_ID")
 COHOST_VOICE_ID = os.getenv("ELEVENLABS_COHOST_VOICE_ID")
 USE_AI_SERVICE = os.getenv("AI_SERVICE", "gemini")
+GEMINI_MODEL = "gemini-pro"
+OPENAI_MODEL = "gpt-4o-mini"
+LLM_TEMPERATURE = 0.7
+
+# Max LLM requests in flight at once (keeps us under provider rate limits)
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "5"))
+# Max TTS requests in flight at once (ElevenLabs caps concurrency per plan)
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "4"))
+# Max page fetches in flight against any one site
+PER_HOST_CONCURRENCY = int(os.getenv("PER_HOST_CONCURRENCY", "4"))
+
+# Process-wide gates: the limits above hold across every pool and every
+# episode the API is generating at the same time, not just within one call
+LLM_GATE = threading.BoundedSemaphore(LLM_CONCURRENCY)
+TTS_GATE = threading.BoundedSemaphore(TTS_CONCURRENCY)
+_host_gates = defaultdict(lambda: threading.BoundedSemaphore(PER_HOST_CONCURRENCY))
+_host_gates_lock = threading.Lock()
+
+def host_gate(url):
+    """Semaphore limiting concurrent requests to the host of url"""
+    with _host_gates_lock:
+        return _host_gates[urlparse(url).netloc]
 
 def clean(txt): 
-    return re.sub(r"\s+", " ", txt).strip()
+    return _WS_RE.sub(" ", txt).strip()
+
+def cache_key(*parts):
+    """Stable cache key for the given string parts"""
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+def tts_cache_path(*parts):
+    """Cache location for the speech identified by the given parts"""
+    return TTS_CACHE_DIR / f"{hashlib.sha256('|'.join(map(str, parts)).encode()).hexdigest()}.mp3"
+
+def store_tts(outpath, cached):
+    """Copy freshly rendered audio into its cache location"""
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_name(f"{uuid.uuid4().hex}.tmp.mp3")
+    shutil.copyfile(outpath, tmp)
+    os.replace(tmp, cached)
 
 def create_custom_intro(episode_metadata, epdir):
-    """Create custom intro based on configuration"""
+    """Create custom intro based on configuration
+
+    Returns the path of the rendered intro MP3, or None if nothing is configured.
+    A composed intro is cached by its inputs, so while the configured intro
+    doesn't change, later episodes reuse it without any TTS or ffmpeg work.
+    """
+    custom_intro_path = CFG.get("episode", {}).get("custom_intro_path")
+    if not (custom_intro_path and Path(custom_intro_path).exists()):
+        custom_intro_path = None
+    custom_intro_text = CFG.get("brand", {}).get("custom_intro_text")
+    sign_on = CFG.get("brand", {}).get("sign_on")
+    
+    # Format the intro text with dynamic content
+    formatted_intro = custom_intro_text and custom_intro_text.format(
+        episode_number=episode_metadata.get("episode_number", ""),
+        date=dt.datetime.now().strftime("%B %d, %Y"),
+        topic_preview=episode_metadata.get("topic_preview", "today's topics")
+    )
+    
+    parts = [custom_intro_path, formatted_intro, sign_on]
+    if sum(map(bool, parts)) > 1:
+        mtime = Path(custom_intro_path).stat().st_mtime_ns if custom_intro_path else ""
+        cached = OUTDIR / ".intro_cache" / f"{cache_key('intro', *map(str, parts), str(mtime), str(HOST_VOICE_ID), ELEVENLABS_MODEL)}.mp3"
+        if cached.exists():
+            print("🎵 Reusing cached intro...")
+            return Path(shutil.copyfile(cached, epdir / "intro.mp3"))
+    
     intro_segments = []
+    # Cleared if any part fell back to another voice or silence
+    primary_voice = True
     
     # 1. Pre-recorded audio intro (if configured)
-    custom_intro_path = CFG.get("episode", {}).get("custom_intro_path")
-    if custom_intro_path and Path(custom_intro_path).exists():
+    if custom_intro_path:
         print("🎵 Adding pre-recorded intro...")
-        intro_audio = AudioSegment.from_file(custom_intro_path)
-        intro_segments.append(intro_audio)
+        intro_segments.append(Path(custom_intro_path))
     
     # 2. Custom text intro (if configured)
-    custom_intro_text = CFG.get("brand", {}).get("custom_intro_text")
-    if custom_intro_text:
+    if formatted_intro:
         print("🎙️ Generating custom intro text...")
         
-        # Format the intro text with dynamic content
-        formatted_intro = custom_intro_text.format(
-            episode_number=episode_metadata.get("episode_number", ""),
-            date=dt.datetime.now().strftime("%B %d, %Y"),
-            topic_preview=episode_metadata.get("topic_preview", "today's topics")
-        )
-        
         # Generate TTS for custom intro
         custom_intro_mp3 = epdir / "custom_intro.mp3"
-        elevenlabs_tts(formatted_intro, HOST_VOICE_ID, custom_intro_mp3)
-        intro_segments.append(AudioSegment.from_mp3(custom_intro_mp3))
+        primary_voice &= elevenlabs_tts(formatted_intro, HOST_VOICE_ID, custom_intro_mp3)
+        intro_segments.append(custom_intro_mp3)
     
     # 3. Standard sign-on (if configured)
-    sign_on = CFG.get("brand", {}).get("sign_on")
     if sign_on:
         sign_on_mp3 = epdir / "sign_on.mp3"
-        elevenlabs_tts(sign_on, HOST_VOICE_ID, sign_on_mp3)
-        intro_segments.append(AudioSegment.from_mp3(sign_on_mp3))
+        primary_voice &= elevenlabs_tts(sign_on, HOST_VOICE_ID, sign_on_mp3)
+        intro_segments.append(sign_on_mp3)
     
-    # Combine all intro segments with small gaps
+    if len(intro_segments) == 1:
+        return intro_segments[0]
+    
+    # Combine all intro segments with 0.5s gaps in one ffmpeg run
     if intro_segments:
-        full_intro = AudioSegment.silent(duration=0)
-        for i, segment in enumerate(intro_segments):
-            full_intro += segment
-            if i < len(intro_segments) - 1:  # Add gap between segments
-                full_intro += AudioSegment.silent(duration=500)  # 0.5s gap
-        return full_intro
+        intro_mp3 = concat_mp3(intro_segments, epdir / "intro.mp3", gap_ms=500)
+        # A fallback voice or placeholder must not be reused as this intro
+        if primary_voice:
+            store_tts(intro_mp3, cached)
+        return intro_mp3
     
-    return AudioSegment.silent(duration=0)
+    return None
 
 def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF file"""
+    """Extract text from PDF file
+
+    Pages are read in order until there is comfortably more text than the
+    script prompt uses, so long documents aren't parsed end to end.
+    """
     try:
+        pymupdf = get_pymupdf()
+        if pymupdf:
+            # PyMuPDF isn't thread-safe; build_script_from_files calls this
+            # serially whenever it's available
+            with pymupdf.open(pdf_path) as doc:
+                return clean(_take_pages(page.get_text() for page in doc))
         with open(pdf_path, 'rb') as file:
+            import PyPDF2
             pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return clean(text)
+            return clean(_take_pages(page.extract_text() for page in pdf_reader.pages))
     except Exception as e:
         print(f"Error reading PDF {pdf_path}: {e}")
         return ""
 
+def _take_pages(page_texts):
+    """Join lazily extracted page texts, stopping past PDF_EXTRACT_CHARS"""
+    buf, n = [], 0
+    for t in page_texts:
+        buf.append(t or "")
+        n += len(t or "")
+        if n >= PDF_EXTRACT_CHARS:
+            break
+    return "\n".join(buf)
+
 def extract_text_from_file(file_path):
     """Extract text from various file formats"""
     file_path = Path(file_path)
@@ -121,180 +294,289 @@ def extract_text_from_file(file_path):
         print(f"Unsupported file format: {file_path.suffix}")
         return ""
 
+def fetch_feed(url, timeout=10):
+    """Fetch a feed's dated entries as (title, link, published) tuples
+
+    Sends the ETag/Last-Modified from the previous fetch so unchanged feeds
+    answer 304 and are served from cache without downloading or parsing.
+    """
+    key = cache_key("feed", url)
+    state = cache.get(key) or {}
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("modified"):
+        headers["If-Modified-Since"] = state["modified"]
+    
+    # Download through the pooled session; feedparser only parses the bytes
+    try:
+        with host_gate(url):
+            response = http_session.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Feed fetch failed for {url}: {e}")
+        return state.get("entries", [])
+    if response.status_code == 304:
+        return state.get("entries", [])
+    
+    import feedparser
+    f = feedparser.parse(response.content, response_headers=dict(response.headers))
+    entries = []
+    for e in f.entries:
+        published = getattr(e, "published_parsed", None)
+        if not published: continue
+        entries.append((e.title, e.link, tuple(published[:6])))
+    
+    etag, modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    if response.status_code == 200 and (etag or modified):
+        cache.set(key, {"etag": etag, "modified": modified, "entries": entries})
+    return entries
+
+def canonical_url(url):
+    """url without tracking params, fragment, trailing slash or host case"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if not k.startswith("utm_")]
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), urlencode(query), ""))
+
+def keyword_re(keywords):
+    """One case-insensitive pattern matching any of keywords, or None if empty"""
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+# Title filters, scanned once per title instead of once per keyword
+_INCLUDE_RE = keyword_re(CFG["filters"]["include_keywords"])
+_EXCLUDE_RE = keyword_re(CFG["filters"]["exclude_keywords"])
+
 def fetch_recent_items():
     """Fetch recent items from RSS feeds"""
     picks = []
     cutoff = dt.datetime.utcnow() - dt.timedelta(days=2)
-    for url in CFG["feeds"]:
-        f = feedparser.parse(url)
-        for e in f.entries:
-            published = getattr(e, "published_parsed", None)
-            if not published: continue
-            pdt = dt.datetime(*published[:6])
+    
+    # Download and parse all feeds concurrently; each one is a separate HTTP round-trip
+    feeds = CFG["feeds"]
+    with ThreadPoolExecutor(max_workers=max(len(feeds), 1)) as pool:
+        parsed = list(pool.map(fetch_feed, feeds))
+    
+    for entries in parsed:
+        for title, link, published in entries:
+            pdt = dt.datetime(*published)
             if pdt < cutoff: continue
-            title = e.title
-            link = e.link
-            if CFG["filters"]["include_keywords"]:
-                if not any(k.lower() in title.lower() for k in CFG["filters"]["include_keywords"]): 
-                    continue
-            if CFG["filters"]["exclude_keywords"]:
-                if any(k.lower() in title.lower() for k in CFG["filters"]["exclude_keywords"]):
-                    continue
+            if _INCLUDE_RE and not _INCLUDE_RE.search(title):
+                continue
+            if _EXCLUDE_RE and _EXCLUDE_RE.search(title):
+                continue
             picks.append({"title": title, "link": link, "type": "rss"})
     
+    # The same story often appears in several feeds with tracking params or
+    # slightly different link formatting. Links are compared canonicalized;
+    # titles only count as a match on the same site, since different stories
+    # can share a title
     seen = set()
     uniq = []
     for it in picks:
-        t = it["title"]
-        if t in seen: continue
-        seen.add(t)
+        link = canonical_url(it["link"])
+        keys = {("link", link), ("title", urlsplit(link).netloc, clean(it["title"]).lower())}
+        if keys & seen: continue
+        seen |= keys
         uniq.append(it)
     return uniq[:MAX_STORIES]
 
 def fetch_page_text(url, timeout=10):
     """Fetch and extract text from web page"""
+    key = cache_key("page", url)
+    text = cache.get(key)
+    if text is not None:
+        return text
     try:
-        html = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}).text
-        soup = BeautifulSoup(html, "html.parser")
-        for s in soup(["script", "style", "noscript"]): 
-            s.decompose()
-        return clean(soup.get_text(" "))
+        with host_gate(url):
+            html = http_session.get(url, timeout=timeout).text
+        tree = HTMLParser(html)
+        for node in tree.css("script, style, noscript"):
+            node.decompose()
+        root = tree.body or tree.root
+        text = clean(root.text(separator=" ")) if root else ""
     except Exception:
         return ""
+    if text:
+        cache.set(key, text, expire=PAGE_CACHE_TTL)
+    return text
 
-def llm(prompt, sys="You are a concise journalist host for a tech/AI podcast.", use_service=None):
-    """Generate text using either Gemini or OpenAI"""
+def llm(prompt, sys="You are a concise journalist host for a tech/AI podcast.", use_service=None, json_mode=False, validate=None):
+    """Generate text using either Gemini or OpenAI
+
+    json_mode asks OpenAI for a JSON object response; for Gemini the prompt itself
+    must ask for JSON. Replies are cached on disk for LLM_CACHE_TTL, so a repeated
+    prompt returns the earlier reply without another API call. If validate is
+    given, only replies for which validate(reply) is true are cached.
+    """
     service = use_service or USE_AI_SERVICE
-    
+    text = cache.get(llm_cache_key(service, sys, prompt, json_mode))
+    if text is None:
+        text, answered_by = _generate(prompt, sys, service, json_mode)
+        # Keyed by the service that answered: a reply from the OpenAI fallback
+        # is not served for later Gemini requests, which retry Gemini instead
+        if text and (validate is None or validate(text)):
+            cache.set(llm_cache_key(answered_by, sys, prompt, json_mode), text, expire=LLM_CACHE_TTL)
+    return text
+
+def llm_cache_key(service, sys, prompt, json_mode):
+    model = GEMINI_MODEL if service == "gemini" else OPENAI_MODEL
+    return cache_key("llm", service, model, str(LLM_TEMPERATURE), str(json_mode), sys, prompt)
+
+def _generate(prompt, sys, service, json_mode):
+    """Returns (reply, service that produced it)"""
     if service == "gemini":
         try:
-            model = genai.GenerativeModel('gemini-pro')
+            model = get_genai().GenerativeModel(GEMINI_MODEL)
             full_prompt = f"{sys}\n\n{prompt}"
-            response = model.generate_content(full_prompt)
-            return response.text
+            with LLM_GATE:
+                response = model.generate_content(full_prompt)
+            return response.text, "gemini"
         except Exception as e:
             print(f"Gemini API error: {e}")
             service = "openai"
     
     if service == "openai":
-        return openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "system", "content": sys}, {"role": "user", "content": prompt}],
-            temperature=0.7,
-        ).choices[0].message.content
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        with LLM_GATE:
+            reply = get_openai_client().chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[{"role": "system", "content": sys}, {"role": "user", "content": prompt}],
+                temperature=LLM_TEMPERATURE,
+                **extra,
+            ).choices[0].message.content
+        return reply, "openai"
+    
+    return None, service
+
+def parse_json_reply(text):
+    """Parse a JSON reply from the LLM, tolerating markdown code fences"""
+    text = (text or "").strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+    return orjson.loads(text)
 
 def elevenlabs_tts(text, voice_id, outpath):
-    """Generate speech using ElevenLabs"""
+    """Generate speech using ElevenLabs
+
+    Returns True if outpath holds voice_id's speech, False if it came from a
+    fallback (OpenAI's voice or a silent placeholder).
+    """
+    cached = tts_cache_path(voice_id, ELEVENLABS_MODEL, text)
+    if cached.exists():
+        shutil.copyfile(cached, outpath)
+        return True
     try:
-        # ElevenLabs 2.x API
-        audio = elevenlabs_client.text_to_speech.convert(
-            voice_id=voice_id,
-            text=text,
-            model_id="eleven_monolingual_v1"
-        )
-        
-        # Save the audio
-        with open(outpath, 'wb') as f:
-            for chunk in audio:
-                f.write(chunk)
+        # The gate is released before any fallback so it is never held twice
+        with TTS_GATE:
+            # ElevenLabs 2.x API
+            audio = get_elevenlabs_client().text_to_speech.convert(
+                voice_id=voice_id,
+                text=text,
+                model_id=ELEVENLABS_MODEL
+            )
+            
+            # convert() yields the MP3 as it streams in; writelines drains the
+            # iterator to disk in C without buffering the whole file
+            with open(outpath, 'wb') as f:
+                f.writelines(audio)
+        store_tts(outpath, cached)
+        return True
                 
     except Exception as e:
         print(f"ElevenLabs TTS error: {e}")
         print("Falling back to OpenAI TTS...")
         openai_tts(text, outpath)
+        return False
 
 def openai_tts(text, outpath):
-    """Fallback TTS using OpenAI"""
-    try:
-        response = openai_client.audio.speech.create(
-            model="tts-1",
-            voice="alloy",
-            input=text
-        )
-        # Write bytes directly to file
-        with open(outpath, 'wb') as f:
-            f.write(response.content)
-    except Exception as e:
-        print(f"OpenAI TTS error: {e}")
-        # Create silent placeholder if both fail
-        from pydub import AudioSegment
-        silent = AudioSegment.silent(duration=1000)
-        silent.export(outpath, format="mp3")
+    """Fallback TTS using OpenAI
 
-def openai_tts(text, outpath):
-    """Fallback TTS using OpenAI"""
+    Returns True if speech was synthesized, False if a silent placeholder was written.
+    """
+    cached = tts_cache_path(OPENAI_TTS_VOICE, OPENAI_TTS_MODEL, text)
+    if cached.exists():
+        shutil.copyfile(cached, outpath)
+        return True
     try:
-        response = openai_client.audio.speech.create(
-            model="tts-1",
-            voice="alloy",
+        # Stream the response body to disk instead of buffering the whole MP3
+        with TTS_GATE, get_openai_client().audio.speech.with_streaming_response.create(
+            model=OPENAI_TTS_MODEL,
+            voice=OPENAI_TTS_VOICE,
             input=text
-        )
-        # Write bytes directly to file
-        with open(outpath, 'wb') as f:
-            f.write(response.content)
+        ) as response:
+            response.stream_to_file(outpath)
+        store_tts(outpath, cached)
+        return True
     except Exception as e:
         print(f"OpenAI TTS error: {e}")
-        # Create silent placeholder if both fail
-        from pydub import AudioSegment
-        silent = AudioSegment.silent(duration=1000)
-        silent.export(outpath, format="mp3")
+        # Use a shared silent placeholder if both fail
+        shutil.copyfile(silence_mp3(1000, 44100, 1), outpath)
+        return False
+
+def write_file_segment(file_content):
+    """Write a two-host dialogue segment discussing one document"""
+    seg_prompt = f"""
+    Create a 3-4 minute conversational segment between two podcast hosts discussing this document.
+    Document: {file_content.filename}
+    Content preview: {file_content.content}
+    
+    Write as natural dialogue with HOST1 and HOST2 tags. Include:
+    - Key insights and takeaways
+    - Different perspectives from each host
+    - Questions and reactions
+    - Practical implications
+    
+    Keep it engaging and informative.
+    """
+    return llm(seg_prompt)
 
 def build_script_from_files(file_paths):
     """Build podcast script from uploaded files"""
     file_contents = []
     
-    for file_path in file_paths:
-        text = extract_text_from_file(file_path)
+    # PyMuPDF doesn't support use from multiple threads (it can crash the
+    # interpreter), so files are only extracted in parallel without it
+    if get_pymupdf():
+        texts = [extract_text_from_file(p) for p in file_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=max(len(file_paths), 1)) as pool:
+            texts = list(pool.map(extract_text_from_file, file_paths))
+    for file_path, text in zip(file_paths, texts):
         if text:
-            file_contents.append({
-                "filename": Path(file_path).name,
-                "content": text[:8000],
-                "type": "file"
-            })
+            file_contents.append(FileSource(Path(file_path).name, text[:FILE_CONTENT_CHARS]))
     
     if not file_contents:
-        return None, [], None, []
+        return None, [], None, [], {}
     
     # Create topic preview for intro
-    topics = [f["filename"] for f in file_contents]
+    topics = [f.filename for f in file_contents]
     topic_preview = f"discussing {', '.join(topics[:2])}" + (f" and {len(topics)-2} more documents" if len(topics) > 2 else "")
     
     # Generate conversation-style script for two hosts
     # Note: No longer including sign-on in the main content since it's handled by custom intro
     main_content_prompt = f"""
     Create the main content for a podcast episode between two hosts discussing uploaded documents.
-    Files being discussed: {[f['filename'] for f in file_contents]}
+    Files being discussed: {[f.filename for f in file_contents]}
     
     Do NOT include any introductory greetings or sign-ons - just start with the content discussion.
     Make it conversational and engaging. Write as dialogue with HOST1 and HOST2 tags.
     Focus on the key insights and analysis.
     """
     
-    segments = []
-    for file_content in file_contents:
-        seg_prompt = f"""
-        Create a 3-4 minute conversational segment between two podcast hosts discussing this document.
-        Document: {file_content['filename']}
-        Content preview: {file_content['content']}
-        
-        Write as natural dialogue with HOST1 and HOST2 tags. Include:
-        - Key insights and takeaways
-        - Different perspectives from each host
-        - Questions and reactions
-        - Practical implications
-        
-        Keep it engaging and informative.
-        """
-        segments.append(llm(seg_prompt))
-    
     outro_prompt = f"""
     Create a 30-second podcast outro for two hosts wrapping up their discussion.
     Include: "{CFG['brand']['sign_off']}"
     Write as dialogue with HOST1 and HOST2 tags.
     """
     
-    main_content = llm(main_content_prompt)
-    outro = llm(outro_prompt)
+    # Main content, outro and every per-file segment are independent prompts
+    with ThreadPoolExecutor(max_workers=LLM_CONCURRENCY) as pool:
+        main_future = pool.submit(llm, main_content_prompt)
+        outro_future = pool.submit(llm, outro_prompt)
+        segments = list(pool.map(write_file_segment, file_contents))
+        main_content = main_future.result()
+        outro = outro_future.result()
     
     # Return metadata for intro generation
     metadata = {
@@ -305,37 +587,74 @@ def build_script_from_files(file_paths):
     
     return main_content, segments, outro, file_contents, metadata
 
+def parse_story(reply):
+    """The {"points", "segment"} story in a JSON reply, or None if malformed"""
+    try:
+        parsed = parse_json_reply(reply)
+        points = parsed["bullets"]
+        if isinstance(points, list):
+            points = "\n".join(f"- {p}" for p in points)
+        return {"points": points, "segment": parsed["segment"]}
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        return None
+
+def script_story(it):
+    """Summarize a story and write its single-host segment in one LLM call
+
+    Returns (Bullet, segment_text).
+    """
+    key = cache_key("story", STORY_PROMPT_VERSION, it["link"])
+    story = cache.get(key)
+    if story is None:
+        page = fetch_page_text(it["link"])
+        reply = llm(
+            f"Title: {it['title']}\n\nSource:\n{page[:4000]}\n\n"
+            "Return a JSON object with two string fields:\n"
+            '- "bullets": an objective summary in 3-4 tight bullet points\n'
+            '- "segment": a ~2 minute spoken segment with a single host. '
+            "Lead with why it matters, then the facts, then a takeaway. "
+            f"Cite the source URL at the end: {it['link']}",
+            json_mode=True,
+            # An unparseable reply isn't cached, so the next run asks again
+            validate=lambda reply: parse_story(reply) is not None,
+        )
+        story = parse_story(reply)
+        if story is None:
+            print(f"⚠️  Unstructured reply for {it['title']!r}, using it as the segment")
+            story = {"points": "", "segment": reply or ""}
+        elif page:
+            # A story written from the title alone (page fetch failed) isn't
+            # cached, and cached stories age out along with their pages
+            cache.set(key, story, expire=PAGE_CACHE_TTL)
+    return Bullet(it["title"], story["points"], it["link"]), story["segment"]
+
 def build_script_from_rss(items):
     """Build podcast script from RSS items"""
-    bullets = []
-    for it in items:
-        page = fetch_page_text(it["link"])
-        summ = llm(f"Summarize objectively in 3-4 tight bullet points. Title: {it['title']}\n\nSource:\n{page[:4000]}")
-        bullets.append({"title": it["title"], "points": summ, "link": it["link"]})
-    
-    # Create topic preview for intro
-    topic_preview = f"covering {len(items)} stories including {bullets[0]['title'][:50]}..." if bullets else "the latest tech news"
-    
     # Main content (no sign-on since handled by custom intro)
     main_content_prompt = f"""
     Create the main content introduction for a tech podcast covering today's stories.
-    Stories: {[b['title'] for b in bullets]}
+    Stories: {[it['title'] for it in items]}
     
     Do NOT include any introductory greetings or sign-ons - just start with the content.
     Make it engaging and set up the upcoming segments.
     """
     
-    segs = []
-    for b in bullets:
-        segs.append(llm(
-            "Turn this into a ~2 minute spoken segment with a single host. "
-            "Lead with why it matters, then the facts, then a takeaway. "
-            f"\nTitle: {b['title']}\nBullets:\n{b['points']}\nCite the source URL at the end: {b['link']}"
-        ))
-    
-    outro = llm(f"Write a 20-30s outro. Include: \"{CFG['brand']['sign_off']}\"")
+    # Every LLM call here is an independent network round-trip, so fan them
+    # out over a bounded pool: intro and outro only need the titles and run
+    # alongside the per-story write-ups.
+    with ThreadPoolExecutor(max_workers=LLM_CONCURRENCY) as pool:
+        main_future = pool.submit(llm, main_content_prompt)
+        outro_future = pool.submit(llm, f"Write a 20-30s outro. Include: \"{CFG['brand']['sign_off']}\"")
+        
+        stories = list(pool.map(script_story, items))
+        bullets = [bullet for bullet, _ in stories]
+        segs = [seg for _, seg in stories]
+        
+        main_content = main_future.result()
+        outro = outro_future.result()
     
-    main_content = llm(main_content_prompt)
+    # Create topic preview for intro
+    topic_preview = f"covering {len(items)} stories including {bullets[0].title[:50]}..." if bullets else "the latest tech news"
     
     metadata = {
         "topic_preview": topic_preview,
@@ -346,136 +665,224 @@ def build_script_from_rss(items):
     return main_content, segs, outro, bullets, metadata
 
 def create_dialogue_audio(script_text, segment_name, epdir):
-    """Create audio for dialogue between two hosts"""
+    """Create audio for dialogue between two hosts
+
+    Returns the per-turn clip paths in script order (empty if the script has
+    no spoken lines). They are joined, with pauses, only in the final mix.
+    """
     print(f"DEBUG: create_dialogue_audio called for {segment_name}")
-    host1_lines, host2_lines = separate_dialogue(script_text)
-    print(f"DEBUG: {segment_name} - host1_lines count: {len(host1_lines)}")
-    print(f"DEBUG: {segment_name} - host2_lines count: {len(host2_lines)}")
-    
-    host1_files = []
-    host2_files = []
-    
-    for i, line in enumerate(host1_lines):
-        if line.strip():
-            temp_file = epdir / f"{segment_name}_host1_{i}.mp3"
-            elevenlabs_tts(line, HOST_VOICE_ID, temp_file)
-            host1_files.append(temp_file)
-    
-    for i, line in enumerate(host2_lines):
-        if line.strip():
-            temp_file = epdir / f"{segment_name}_host2_{i}.mp3"
-            elevenlabs_tts(line, COHOST_VOICE_ID, temp_file)
-            host2_files.append(temp_file)
-    
-    final_audio = AudioSegment.silent(duration=0)
-    max_segments = max(len(host1_files), len(host2_files))
-    
-    for i in range(max_segments):
-        if i < len(host1_files):
-            final_audio += AudioSegment.from_mp3(host1_files[i])
-            final_audio += AudioSegment.silent(duration=500)
-        
-        if i < len(host2_files):
-            final_audio += AudioSegment.from_mp3(host2_files[i])
-            final_audio += AudioSegment.silent(duration=500)
+    turns = separate_dialogue(script_text)
+    print(f"DEBUG: {segment_name} - {len(turns)} turns")
     
-    print(f"DEBUG: {segment_name} - Created {len(host1_files)} host1 files, {len(host2_files)} host2 files")
-    print(f"DEBUG: {segment_name} - Final audio length: {len(final_audio)/1000:.1f} seconds")
+    voices = {'HOST1': HOST_VOICE_ID, 'HOST2': COHOST_VOICE_ID}
+    clips = [epdir / f"{segment_name}_{i:03d}_{speaker.lower()}.mp3" for i, (speaker, _) in enumerate(turns)]
     
-    # Clean up temp files
-    for f in host1_files + host2_files:
-        f.unlink()
-        print(f"DEBUG: Deleted {f.name}")
+    # Synthesize every turn concurrently (TTS_GATE caps in-flight requests);
+    # clips stay in script order for the join
+    with ThreadPoolExecutor(max_workers=TTS_CONCURRENCY) as pool:
+        list(pool.map(lambda turn, path: elevenlabs_tts(turn[1], voices[turn[0]], path), turns, clips))
     
-    return final_audio
+    print(f"DEBUG: {segment_name} - Created {len(clips)} clips")
+    return clips
 
 def separate_dialogue(script_text):
-    """Separate dialogue between hosts using configured names"""
-    primary_host = CFG.get("hosts", {}).get("primary", {}).get("name", "HOST1")
-    secondary_host = CFG.get("hosts", {}).get("secondary", {}).get("name", "HOST2")
-    
-    lines = script_text.split('\n')
-    host1_lines = []
-    host2_lines = []
-    
+    """Split a two-host script into (speaker, text) turns in script order
+
+    speaker is 'HOST1' or 'HOST2' (matched by tag or configured name).
+    Consecutive lines from the same speaker, tagged or not, are merged into
+    one turn so each turn is a single TTS request.
+    """
+    turns = []
     current_speaker = None
     current_text = []
     
-    for line in lines:
+    def flush():
+        text = ' '.join(t for t in current_text if t)
+        if current_speaker and text:
+            turns.append((current_speaker, text))
+    
+    for line in script_text.split('\n'):
         line = line.strip()
         if not line:
             continue
-            
-        # Strip various formatting: **, <>, etc.
-        clean_line = line.lstrip('*<').rstrip('>').strip()
-        
-        # Check for primary host (HOST1 or configured name)
-        is_host1 = (clean_line.startswith(f'{primary_host}:') or 
-                   clean_line.startswith(f'{primary_host}>') or
-                   clean_line.startswith('HOST1:') or 
-                   clean_line.startswith('HOST1>'))
         
-        # Check for secondary host (HOST2 or configured name)  
-        is_host2 = (clean_line.startswith(f'{secondary_host}:') or
-                   clean_line.startswith(f'{secondary_host}>') or
-                   clean_line.startswith('HOST2:') or
-                   clean_line.startswith('HOST2>'))
-        
-        if is_host1:
-            if current_speaker and current_text:
-                if current_speaker == 'HOST1':
-                    host1_lines.append(' '.join(current_text))
-                else:
-                    host2_lines.append(' '.join(current_text))
-            current_speaker = 'HOST1'
-            # Extract text after the speaker tag
-            for sep in [':', '>']:
-                if sep in clean_line:
-                    current_text = [clean_line.split(sep, 1)[1].strip()]
-                    break
-                    
-        elif is_host2:
-            if current_speaker and current_text:
-                if current_speaker == 'HOST1':
-                    host1_lines.append(' '.join(current_text))
-                else:
-                    host2_lines.append(' '.join(current_text))
-            current_speaker = 'HOST2'
-            # Extract text after the speaker tag
-            for sep in [':', '>']:
-                if sep in clean_line:
-                    current_text = [clean_line.split(sep, 1)[1].strip()]
-                    break
-                    
-        elif line and current_speaker:
+        # One match both recognizes the speaker tag and captures its text
+        m = _SPEAKER_RE.match(line.rstrip('>'))
+        if m:
+            speaker = 'HOST1' if m.group(1) else 'HOST2'
+            if speaker != current_speaker:
+                flush()
+                current_speaker, current_text = speaker, []
+            current_text.append(m.group(3).lstrip('* ').strip())
+        elif current_speaker:
             current_text.append(line)
     
-    # Add final segment
-    if current_speaker and current_text:
-        if current_speaker == 'HOST1':
-            host1_lines.append(' '.join(current_text))
-        else:
-            host2_lines.append(' '.join(current_text))
+    # Add final turn
+    flush()
     
-    return host1_lines, host2_lines
+    return turns
 
-def mix_segments(audio_segments, bed_path=None):
-    """Mix audio segments with background music"""
-    voice = AudioSegment.silent(duration=0)
-    for segment in audio_segments:
-        voice += segment + AudioSegment.silent(300)
-    
-    voice = normalize(voice)
-    
-    if bed_path and Path(bed_path).exists():
-        bed = AudioSegment.from_file(bed_path)
-        loops = (len(voice) // len(bed)) + 1
-        bed_full = (bed * loops)[:len(voice)]
-        bed_full = bed_full - 18
-        mix = voice.overlay(bed_full)
-        return normalize(mix)
+def run_ffmpeg(*args):
+    """Run ffmpeg quietly, raising CalledProcessError on failure"""
+    subprocess.run(["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", *args], check=True)
+
+BED_GAIN = 0.126  # music bed level relative to the voice
+AUDIO_FORMAT = "aresample=44100,aformat=sample_fmts=fltp:channel_layouts=stereo"
+# EBU R128 normalization to the usual podcast target (loudnorm defaults to -24 LUFS)
+LOUDNORM = "loudnorm=I=-16:TP=-1.5:LRA=11"
+# Join same-format voice MP3s by copying frames instead of re-encoding. Much
+# faster, but the result is not loudness-normalized, so it's opt-in
+MP3_FRAME_JOIN = os.getenv("MP3_FRAME_JOIN", "0") == "1"
+
+def gap_list(gap_ms, n):
+    """Silence after each of n inputs but the last; gap_ms is one value or a list"""
+    if isinstance(gap_ms, (list, tuple)):
+        return list(gap_ms)
+    return [gap_ms] * (n - 1)
+
+def concat_mp3(paths, outpath, gap_ms=300, bed_path=None, bitrate="192k"):
+    """Concatenate audio files into one normalized MP3 in a single ffmpeg run
+
+    Inputs are separated by gap_ms of silence (see gap_list). They are resampled to a
+    common format first since ElevenLabs and OpenAI TTS differ in sample rate.
+    If bed_path is given it is looped by ffmpeg under the voice at -18 dB and
+    the mix is loudness-normalized once, after the overlay.
+    """
+    gaps = gap_list(gap_ms, len(paths))
+    inputs = []
+    chains = []
+    for i, p in enumerate(paths):
+        inputs += ["-i", str(p)]
+        pad = f",apad=pad_dur={gaps[i] / 1000}" if i < len(gaps) and gaps[i] else ""
+        chains.append(f"[{i}:a]{AUDIO_FORMAT}{pad}[a{i}]")
+    labels = "".join(f"[a{i}]" for i in range(len(paths)))
+    concat = f"{labels}concat=n={len(paths)}:v=0:a=1"
+    
+    if bed_path:
+        bed = len(paths)
+        inputs += ["-stream_loop", "-1", "-i", str(bed_path)]
+        chains.append(f"{concat}[voice]")
+        chains.append(f"[{bed}:a]{AUDIO_FORMAT}[bed]")
+        # The bed gain rides on amix's weights (0.126 ~ -18 dB), so overlay,
+        # attenuation and normalization run as one pass
+        chains.append(f"[voice][bed]amix=inputs=2:duration=first:normalize=0:weights='1 {BED_GAIN}',{LOUDNORM},aresample=44100[out]")
+    else:
+        chains.append(f"{concat},{LOUDNORM},aresample=44100[out]")
     
-    return voice
+    run_ffmpeg(*inputs, "-filter_complex", ";".join(chains), "-map", "[out]",
+               "-c:a", "libmp3lame", "-b:a", bitrate, str(outpath))
+    return outpath
+
+# MPEG audio sample rates by version bits (2.5, reserved, 2, 1) and rate index
+_MP3_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+# Layer III bitrates in kbps by bitrate index, for MPEG-1 and MPEG-2/2.5
+_MP3_BITRATES = {
+    True: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    False: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+def mp3_stream_info(path):
+    """Locate the audio frames of an MP3 file
+
+    Returns ((sample_rate, channels), start, end) where start/end bound the
+    audio frames with any ID3v2/ID3v1 tags and a leading Xing/Info/VBRI header
+    frame excluded, or None if the file isn't MPEG Layer III. The header frame
+    describes only this file's length, so it mustn't be copied into a join.
+    """
+    with open(path, "rb") as f:
+        header = f.read(10)
+        start = 0
+        if header[:3] == b"ID3" and len(header) == 10:
+            size = (header[6] & 0x7f) << 21 | (header[7] & 0x7f) << 14 | (header[8] & 0x7f) << 7 | (header[9] & 0x7f)
+            start = 10 + size + (10 if header[5] & 0x10 else 0)
+        f.seek(start)
+        first_frame = f.read(2048)  # enough for the largest Layer III frame's tag
+        h = first_frame[:4]
+        end = f.seek(0, 2)
+        if end - start >= 128:
+            f.seek(end - 128)
+            if f.read(3) == b"TAG":
+                end -= 128
+    
+    if len(h) < 4 or h[0] != 0xFF or h[1] & 0xE0 != 0xE0:
+        return None
+    version, layer, rate_index = (h[1] >> 3) & 3, (h[1] >> 1) & 3, (h[2] >> 2) & 3
+    if version == 1 or layer != 1 or rate_index == 3:
+        return None
+    channels = 1 if h[3] >> 6 == 3 else 2
+    sample_rate = _MP3_RATES[version][rate_index]
+    
+    # A Xing/Info tag sits right after the side info; a VBRI tag 32 bytes in
+    mpeg1 = version == 3
+    side_info = (32 if channels == 2 else 17) if mpeg1 else (17 if channels == 2 else 9)
+    xing_at = 4 + (0 if h[1] & 1 else 2) + side_info
+    if first_frame[xing_at:xing_at + 4] in (b"Xing", b"Info") or first_frame[36:40] == b"VBRI":
+        bitrate = _MP3_BITRATES[mpeg1][h[2] >> 4] if h[2] >> 4 < 15 else 0
+        if not bitrate:
+            return None  # free-format frame; its length can't be derived
+        start += (144 if mpeg1 else 72) * bitrate * 1000 // sample_rate + ((h[2] >> 1) & 1)
+        if start >= end:
+            return None
+    
+    return (sample_rate, channels), start, end
+
+def silence_mp3(ms, sample_rate, channels):
+    """Path of a tagless MP3 holding ms of silence in the given format, created once"""
+    path = OUTDIR / ".silence" / f"silence_{ms}ms_{sample_rate}_{channels}ch.mp3"
+    if not path.exists():
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{uuid.uuid4().hex}.tmp.mp3")
+        layout = "mono" if channels == 1 else "stereo"
+        run_ffmpeg("-f", "lavfi", "-i", f"anullsrc=r={sample_rate}:cl={layout}", "-t", str(ms / 1000),
+                   "-c:a", "libmp3lame", "-b:a", "64k", "-write_xing", "0", "-id3v2_version", "0", str(tmp))
+        os.replace(tmp, path)
+    return path
+
+@lru_cache(maxsize=None)
+def silence_frames(ms, sample_rate, channels):
+    """MPEG frames of silence_mp3(ms, ...), read once per process and reused"""
+    path = silence_mp3(ms, sample_rate, channels)
+    _, start, end = mp3_stream_info(path)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
+
+def join_mp3_frames(streams, outpath, gap_ms=300):
+    """Concatenate MP3 frame data directly, with no decoding or re-encoding
+
+    streams are (path, mp3_stream_info(path)) pairs that share one format.
+    """
+    gaps = gap_list(gap_ms, len(streams))
+    fmt = streams[0][1][0]
+    with open(outpath, "wb") as out:
+        for i, (path, (_, start, end)) in enumerate(streams):
+            if i and gaps[i - 1]:
+                out.write(silence_frames(gaps[i - 1], *fmt))
+            with open(path, "rb") as f:
+                f.seek(start)
+                out.write(f.read(end - start))
+    return outpath
+
+def mix_segments(paths, outpath, bed_path=None, gap_ms=300):
+    """Mix episode segment MP3s, with background music if a bed is configured
+
+    gap_ms is the silence between consecutive parts, one value or a list (see gap_list).
+    Output is normalized to LOUDNORM unless MP3_FRAME_JOIN is set and the
+    parts can be frame-copied, in which case levels are left as synthesized.
+    """
+    if bed_path and not Path(bed_path).exists():
+        bed_path = None
+    
+    # Voice only and every part is an MP3 in the same format: MPEG frames can
+    # simply be appended, so skip decoding and LAME encoding entirely
+    if MP3_FRAME_JOIN and not bed_path:
+        streams = [(p, mp3_stream_info(p)) for p in paths]
+        formats = {info[0] for _, info in streams if info}
+        if streams and all(info for _, info in streams) and len(formats) == 1:
+            return join_mp3_frames(streams, outpath, gap_ms)
+    
+    # ffmpeg decodes, joins, loops the bed and encodes; no PCM is held in Python
+    return concat_mp3(paths, outpath, gap_ms, bed_path=bed_path)
 
 def upload_to_spotify(episode_file, title, description):
     """Upload to Spotify via RSS"""
@@ -492,20 +899,6 @@ def upload_to_website(episode_file, metadata):
             print("⚠️  Website upload URL not configured")
             return False
         
-        # Prepare files for upload
-        files = {}
-        
-        # Always upload the episode
-        with open(episode_file, 'rb') as f:
-            files['audio'] = f.read()
-        
-        # Upload cover image if it exists locally
-        cover_path = CFG["output"].get("cover_png")
-        if cover_path and Path(cover_path).exists():
-            with open(cover_path, 'rb') as f:
-                files['cover'] = f.read()
-            print(f"📸 Uploading cover image: {cover_path}")
-        
         # Upload data
         data = {
             'title': metadata['title'],
@@ -513,15 +906,27 @@ def upload_to_website(episode_file, metadata):
             'api_key': api_key
         }
         
-        # Convert files back to file-like objects for requests
-        upload_files = {}
-        if 'audio' in files:
-            upload_files['audio'] = ('episode.mp3', files['audio'], 'audio/mpeg')
-        if 'cover' in files:
-            cover_ext = Path(cover_path).suffix if cover_path else '.png'
-            upload_files['cover'] = (f'cover{cover_ext}', files['cover'], 'image/png')
-        
-        response = requests.post(website_url, files=upload_files, data=data)
+        with ExitStack() as stack:
+            # Always upload the episode; open handles are read as the body is sent
+            fields = {k: v for k, v in data.items() if v is not None}
+            fields['audio'] = ('episode.mp3', stack.enter_context(open(episode_file, 'rb')), 'audio/mpeg')
+            
+            # Upload cover image if it exists locally
+            cover_path = CFG["output"].get("cover_png")
+            if cover_path and Path(cover_path).exists():
+                cover_ext = Path(cover_path).suffix
+                fields['cover'] = (f'cover{cover_ext}', stack.enter_context(open(cover_path, 'rb')), 'image/png')
+                print(f"📸 Uploading cover image: {cover_path}")
+            
+            MultipartEncoder = get_multipart_encoder()
+            if MultipartEncoder:
+                # Streams the multipart body from the files in small blocks
+                body = MultipartEncoder(fields=fields)
+                response = http_session.post(website_url, data=body, headers={'Content-Type': body.content_type})
+            else:
+                # requests assembles the multipart body in memory
+                files = {k: v for k, v in fields.items() if isinstance(v, tuple)}
+                response = http_session.post(website_url, files=files, data=data)
         response.raise_for_status()
         
         result = response.json() if response.headers.get('content-type', '').startswith('application/json') else {}
@@ -555,7 +960,7 @@ Listen now: {episode_metadata.get('website_url', 'demetri.xyz')}
         if len(tweet_text) > 280:
             tweet_text = tweet_text[:277] + "..."
         
-        response = twitter_client.create_tweet(text=tweet_text)
+        response = get_twitter_client().create_tweet(text=tweet_text)
         print(f"🐦 Posted to Twitter: {response.data['id']}")
         return True
         
@@ -563,54 +968,60 @@ Listen now: {episode_metadata.get('website_url', 'demetri.xyz')}
         print(f"❌ Twitter post failed: {e}")
         return False
 
+# How a feed written by ET.indent + tree.write ends
+RSS_FOOTER = b"</channel>\n</rss>"
+
 def write_rss(episode_mp3, title, desc, pubdate, cover_url=None):
     """Generate RSS feed entry"""
     rss_path = OUTDIR / "feed.xml"
     base_url = os.getenv("RSS_SITE", "https://demetri.xyz").rstrip("/")
     item_url = f"{base_url}/podcast/{episode_mp3.name}"
     
-    # Use provided cover URL or generate default one
-    if cover_url:
-        cover_tag = f"<itunes:image href=\"{cover_url}\"/>"
-    else:
-        # Fallback to default cover URL pattern
-        cover_tag = f"<itunes:image href=\"{base_url}/podcast/cover.png\"/>"
-    
-    existing = rss_path.read_text() if rss_path.exists() else None
-    
-    header = f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
-<channel>
-<title>{TITLE}</title>
-<link>{base_url}</link>
-<description>{TITLE} — AI-generated discussions on tech, AI, and important documents.</description>
-<language>en-us</language>
-<managingEditor>{os.getenv('RSS_EMAIL')} ({os.getenv('RSS_AUTHOR')})</managingEditor>
-{cover_tag}
-"""
-    
-    item = f"""
-<item>
-  <title>{title}</title>
-  <description><![CDATA[{desc}]]></description>
-  <pubDate>{pubdate}</pubDate>
-  <enclosure url="{item_url}" length="{episode_mp3.stat().st_size}" type="audio/mpeg"/>
-  <guid>{uuid.uuid4()}</guid>
-</item>
-"""
-    
-    footer = "\n</channel>\n</rss>\n"
-    
-    if existing:
-        content = existing.replace("</channel>\n</rss>\n", item + footer)
+    # Build the item with ElementTree so titles/descriptions are escaped properly
+    item = ET.Element("item")
+    ET.SubElement(item, "title").text = title
+    ET.SubElement(item, "description").text = desc
+    ET.SubElement(item, "pubDate").text = pubdate
+    ET.SubElement(item, "enclosure", url=item_url, length=str(episode_mp3.stat().st_size), type="audio/mpeg")
+    ET.SubElement(item, "guid").text = str(uuid.uuid4())
+    
+    # Fast path: the feed was last written by us, so it ends in a known
+    # footer; overwrite that with the new item and the footer again
+    if rss_path.exists() and rss_path.stat().st_size > len(RSS_FOOTER):
+        with open(rss_path, "r+b") as f:
+            f.seek(-len(RSS_FOOTER), os.SEEK_END)
+            if f.read() == RSS_FOOTER:
+                ET.indent(item, level=2)
+                f.seek(-len(RSS_FOOTER), os.SEEK_END)
+                f.write(b"  " + ET.tostring(item, encoding="unicode").encode() + b"\n  " + RSS_FOOTER)
+                return item_url
+    
+    if rss_path.exists():
+        tree = ET.parse(rss_path)
+        channel = tree.getroot().find("channel")
     else:
-        content = header + item + footer
-    
-    rss_path.write_text(content)
+        rss = ET.Element("rss", version="2.0")
+        channel = ET.SubElement(rss, "channel")
+        ET.SubElement(channel, "title").text = TITLE
+        ET.SubElement(channel, "link").text = base_url
+        ET.SubElement(channel, "description").text = f"{TITLE} — AI-generated discussions on tech, AI, and important documents."
+        ET.SubElement(channel, "language").text = "en-us"
+        ET.SubElement(channel, "managingEditor").text = f"{os.getenv('RSS_EMAIL')} ({os.getenv('RSS_AUTHOR')})"
+        # Use provided cover URL or fall back to the default cover URL pattern
+        ET.SubElement(channel, f"{{{ITUNES_NS}}}image", href=cover_url or f"{base_url}/podcast/cover.png")
+        tree = ET.ElementTree(rss)
+    
+    channel.append(item)
+    ET.indent(tree)
+    tree.write(rss_path, encoding="UTF-8", xml_declaration=True)
     return item_url
 
-def main(uploaded_files=None):
-    """Main function - can process either uploaded files or RSS feeds"""
+def main(uploaded_files=None, progress_cb=None):
+    """Main function - can process either uploaded files or RSS feeds
+
+    progress_cb(percent, message), if given, is called as each stage starts.
+    """
+    report = progress_cb or (lambda progress, message: None)
     ts = dt.datetime.utcnow().strftime("%Y%m%d-%H%M")
     epdir = OUTDIR / ts
     epdir.mkdir(parents=True, exist_ok=True)
@@ -618,11 +1029,14 @@ def main(uploaded_files=None):
     # Determine content source and build script
     if uploaded_files:
         print(f"📁 Processing {len(uploaded_files)} uploaded files...")
+        report(20, 'Extracting text and generating script...')
         main_content, segs, outro, sources, metadata = build_script_from_files(uploaded_files)
         content_type = "files"
     else:
         print("📡 Fetching from RSS feeds...")
+        report(20, 'Fetching RSS feeds...')
         items = fetch_recent_items()
+        report(40, 'Generating script with AI...')
         main_content, segs, outro, sources, metadata = build_script_from_rss(items)
         content_type = "rss"
     
@@ -633,68 +1047,75 @@ def main(uploaded_files=None):
     # Add episode number to metadata
     metadata["episode_number"] = ts
     
-    # Create custom intro
-    print("🎵 Creating custom intro...")
-    custom_intro = create_custom_intro(metadata, epdir)
-    
     # Write scripts
     (epdir / "script_intro.txt").write_text(main_content)
     for i, s in enumerate(segs, 1): 
         (epdir / f"script_seg{i}.txt").write_text(s)
     (epdir / "script_outro.txt").write_text(outro)
-    (epdir / "sources.json").write_text(json.dumps(sources, indent=2))
+    (epdir / "sources.json").write_bytes(orjson.dumps([s._asdict() for s in sources], option=orjson.OPT_INDENT_2))
     
     # Generate audio
+    report(60, 'Creating voice audio...')
     print("🎙️  Generating audio...")
     print(f"DEBUG: content_type = {content_type}")
     print(f"DEBUG: HOST_VOICE_ID = {HOST_VOICE_ID}")
     print(f"DEBUG: COHOST_VOICE_ID = {COHOST_VOICE_ID}")
     
-    # Main content audio
-    if content_type == "files" and (HOST_VOICE_ID and COHOST_VOICE_ID):
-        main_audio = create_dialogue_audio(main_content, "main", epdir)
-        
-        seg_audios = []
-        for i, s in enumerate(segs, 1):
-            seg_audio = create_dialogue_audio(s, f"seg{i}", epdir)
-            seg_audios.append(seg_audio)
+    # The intro, main content, segments and outro don't depend on each other,
+    # so they render side by side (TTS_GATE still caps requests in flight)
+    with ThreadPoolExecutor(max_workers=len(segs) + 3) as stages:
+        print("🎵 Creating custom intro...")
+        intro_future = stages.submit(create_custom_intro, metadata, epdir)
         
-        outro_audio = create_dialogue_audio(outro, "outro", epdir)
-    else:
-        # Single voice format
-        main_mp3 = epdir / "main.mp3"
-        elevenlabs_tts(main_content, HOST_VOICE_ID or "default", main_mp3)
-        main_audio = AudioSegment.from_mp3(main_mp3)
-        
-        seg_audios = []
-        for i, s in enumerate(segs, 1):
-            seg_mp3 = epdir / f"seg{i}.mp3"
-            elevenlabs_tts(s, HOST_VOICE_ID or "default", seg_mp3)
-            seg_audios.append(AudioSegment.from_mp3(seg_mp3))
+        # Main content audio
+        if content_type == "files" and (HOST_VOICE_ID and COHOST_VOICE_ID):
+            main_future = stages.submit(create_dialogue_audio, main_content, "main", epdir)
+            seg_futures = [stages.submit(create_dialogue_audio, s, f"seg{i}", epdir) for i, s in enumerate(segs, 1)]
+            outro_future = stages.submit(create_dialogue_audio, outro, "outro", epdir)
+            groups = [main_future.result(), *[f.result() for f in seg_futures], outro_future.result()]
+            dialogue_clips = [clip for group in groups for clip in group]
+        else:
+            # Single voice format
+            main_mp3 = epdir / "main.mp3"
+            seg_mp3s = [epdir / f"seg{i}.mp3" for i in range(1, len(segs) + 1)]
+            outro_mp3 = epdir / "outro.mp3"
+            
+            voice_id = HOST_VOICE_ID or "default"
+            tts_jobs = [(main_content, main_mp3), *zip(segs, seg_mp3s), (outro, outro_mp3)]
+            for f in [stages.submit(elevenlabs_tts, text, voice_id, path) for text, path in tts_jobs]:
+                f.result()
+            groups = [[main_mp3], *[[p] for p in seg_mp3s], [outro_mp3]]
+            dialogue_clips = []
         
-        outro_mp3 = epdir / "outro.mp3"
-        elevenlabs_tts(outro, HOST_VOICE_ID or "default", outro_mp3)
-        outro_audio = AudioSegment.from_mp3(outro_mp3)
+        intro_mp3 = intro_future.result()
     
     # Mix final episode with custom intro
     print("🎵 Mixing final episode...")
+    report(80, 'Mixing final episode...')
     final = epdir / f"{TITLE.lower().replace(' ', '_')}_{ts}.mp3"
     
-    # Combine: Custom Intro + Main Content + Segments + Outro
-    all_segments = [custom_intro, main_audio] + seg_audios + [outro_audio, custom_outro]
+    # Combine: Custom Intro + Main Content + Segments + Outro in one pass.
+    # Dialogue turns are joined here too (500ms apart; 300ms between parts),
+    # so no per-segment file is encoded and read back.
+    all_segments, gaps = [], []
+    for group in [[intro_mp3] if intro_mp3 else [], *groups]:
+        if not group: continue
+        if all_segments: gaps.append(300)
+        gaps += [500] * (len(group) - 1)
+        all_segments += group
     print(f"DEBUG: Mixing {len(all_segments)} segments")
     for i, seg in enumerate(all_segments):
-        if seg is not None:
-            print(f"DEBUG: Segment {i}: {len(seg)/1000:.1f} seconds")
-        else:
-            print(f"DEBUG: Segment {i}: None!")
-    mix = mix_segments(all_segments, CFG["episode"].get("music_bed_path") or None)
-    mix.export(final, format="mp3", bitrate="192k")
+        print(f"DEBUG: Segment {i}: {seg.name}")
+    mix_segments(all_segments, final, CFG["episode"].get("music_bed_path") or None, gaps)
+    
+    # Clean up temp files
+    for clip in dialogue_clips:
+        clip.unlink()
     
     # Generate episode metadata
     ep_title = f"{TITLE} — {dt.datetime.utcnow():%b %d, %Y}"
     if content_type == "files":
-        desc = f"Deep dive discussion on: {', '.join([s['filename'] for s in sources])}"
+        desc = f"Deep dive discussion on: {', '.join([s.filename for s in sources])}"
     else:
         desc = "Auto-generated episode covering today's top AI/tech stories."
     
@@ -707,12 +1128,14 @@ def main(uploaded_files=None):
     }
     
     print("🚀 Distributing episode...")
+    report(90, 'Uploading to platforms...')
     
     # Upload to website (this also uploads cover image)
     cover_url = upload_to_website(final, episode_metadata)
     
     # Create RSS entry with uploaded cover URL
     print("📡 Updating RSS feed...")
+    report(95, 'Finalizing...')
     episode_url = write_rss(final, ep_title, desc, 
                            dt.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S +0000"),
                            cover_url if isinstance(cover_url, str) else None)